@@ -15,4 +15,4 @@ from .pages import (  # noqa
     SkipItem,
 )
 from .selectors import SelectorError, Selector, XPath, SimilarLink, CSS  # noqa
-from .sources import Source, URL, NullSource  # noqa
+from .sources import Source, URL, NullSource, ConditionalCache  # noqa
@@ -14,7 +14,7 @@ import lxml.html  # type: ignore
 import click
 from scrapelib import Scraper, SQLiteCache
 from .utils import _display, _obj_to_dict, attr_has, attr_fields
-from .sources import URL, Source
+from .sources import URL, Source, ConditionalCache, _pooled_scraper
 from .pages import Page, ListPage
 
 
@@ -63,6 +63,12 @@ def scraper_params(func: typing.Callable) -> typing.Callable:
         help="use a cache to avoid making unnecessary requests",
         is_flag=True,
     )
+    @click.option(
+        "--http-cache",
+        help="path to a cache of responses that are revalidated with conditional "
+        "requests (ETag/Last-Modified) instead of being downloaded again",
+        default=None,
+    )
     def newfunc(
         header: typing.List[str],
         retries: int,
@@ -73,9 +79,10 @@ def scraper_params(func: typing.Callable) -> typing.Callable:
         verbosity: int,
         verify: bool,
         fastmode: bool,
+        http_cache: typing.Optional[str],
         **kwargs: str,
     ) -> None:
-        scraper = Scraper(
+        scraper = _pooled_scraper(
             requests_per_minute=rpm,
             retry_attempts=retries,
             retry_wait_seconds=retry_wait,
@@ -90,6 +97,8 @@ def scraper_params(func: typing.Callable) -> typing.Callable:
         if fastmode:
             scraper.cache_storage = SQLiteCache("spatula-cache.db")
             scraper.cache_write_only = False
+        if http_cache:
+            scraper.http_cache = ConditionalCache(http_cache)  # type: ignore
 
         if verbosity == -1:
             level = logging.INFO if func.__name__ != "test" else logging.DEBUG
@@ -1,16 +1,337 @@
 import io
+import os
+import codecs
+import re
 import csv
-import tempfile
+import copy
+import json
+import hashlib
+import itertools
+import collections
+import concurrent.futures
 import subprocess
 import logging
+import threading
 import warnings
 import typing
+import urllib.parse
 import scrapelib
 import lxml.html  # type: ignore
 from openpyxl import load_workbook  # type: ignore
-from .sources import Source, URL
+from .sources import Source, URL, _pooled_scraper
 from .utils import _obj_to_dict
 
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+try:
+    import pyarrow.csv  # type: ignore
+    import pyarrow.json  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# size of chunks read from streamed responses
+_CHUNK_SIZE = 32 * 1024
+# content types for which response.text is likely to be used
+_TEXTUAL_CONTENT_TYPE = re.compile(r"^text/|xml|javascript|csv", re.IGNORECASE)
+# documents lxml.html.fromstring treats as a whole page rather than a fragment
+_FULL_HTML = re.compile(rb"^\s*<(?:html|!doctype)", re.IGNORECASE)
+# upper bound on dependencies of a single page fetched at once
+_MAX_DEPENDENCY_WORKERS = 8
+# number of (dependency, input) results kept for reuse by other pages
+_DEPENDENCY_CACHE_SIZE = 128
+# pages (and their dependencies) may be fetched from several threads
+_dependency_cache_lock = threading.Lock()
+# stands in for a missing cache entry, since None is a valid result
+_MISSING = object()
+
+# libxml2 parsers are not reentrant, so parsers are reused per-thread
+_parsers = threading.local()
+
+# trees parsed from content seen more than once, see _cached_parse
+_PARSE_CACHE_SIZE = 32
+_parse_cache: "collections.OrderedDict[typing.Tuple[str, bytes], typing.Any]" = (
+    collections.OrderedDict()
+)
+# keys of content seen once so far, only content seen again is worth a tree copy
+_PARSE_SEEN_SIZE = 1024
+_parse_seen: "collections.OrderedDict[typing.Tuple[str, bytes], None]" = (
+    collections.OrderedDict()
+)
+_parse_cache_lock = threading.Lock()
+
+
+def _get_html_parser(encoding: typing.Optional[str] = None) -> lxml.html.HTMLParser:
+    cache = getattr(_parsers, "html", None)
+    if cache is None:
+        cache = _parsers.html = {}
+    if encoding not in cache:
+        cache[encoding] = lxml.html.HTMLParser(
+            encoding=encoding,
+            recover=True,
+            remove_blank_text=False,
+            remove_comments=False,
+        )
+    return cache[encoding]
+
+
+def _get_xml_parser() -> lxml.etree.XMLParser:
+    parser = getattr(_parsers, "xml", None)
+    if parser is None:
+        # collect_ids=False skips building an id->element table nobody uses,
+        # resolve_entities=False and no_network=True also rule out XXE attacks
+        parser = _parsers.xml = lxml.etree.XMLParser(
+            collect_ids=False,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=False,
+        )
+    return parser
+
+
+def _cached_parse(
+    kind: str, content: typing.Any, parse: typing.Callable[[], typing.Any]
+) -> typing.Any:
+    """
+    if SPATULA_PARSE_CACHE=1, reuse trees already parsed from identical content
+    during this run, returning a copy since pages are free to modify their tree
+
+    a tree is only kept once its content has been seen twice, so content that is
+    never repeated costs a hash and nothing more
+    """
+    if os.environ.get("SPATULA_PARSE_CACHE") != "1" or not isinstance(content, bytes):
+        return parse()
+    key = (kind, hashlib.blake2b(content).digest())
+    seen = False
+    with _parse_cache_lock:
+        root = _parse_cache.get(key)
+        if root is not None:
+            _parse_cache.move_to_end(key)
+        elif key in _parse_seen:
+            del _parse_seen[key]
+            seen = True
+        else:
+            _parse_seen[key] = None
+            if len(_parse_seen) > _PARSE_SEEN_SIZE:
+                _parse_seen.popitem(last=False)
+    if root is not None:
+        return copy.deepcopy(root)
+
+    root = parse()
+    if not seen:
+        return root
+    with _parse_cache_lock:
+        _parse_cache[key] = root
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return copy.deepcopy(root)
+
+
+def _feed_parser(parser: typing.Any, chunks: typing.Iterable[bytes]) -> typing.Any:
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+    except BaseException:
+        # parsers are reused, make sure this one doesn't carry a partial document
+        try:
+            parser.close()
+        except lxml.etree.LxmlError:
+            pass
+        raise
+    return parser.close()
+
+
+def _html_fragment_root(doc: typing.Any, start: bytes) -> typing.Any:
+    """
+    the element lxml.html.fromstring would return for a document starting with
+    `start`, so that streamed and buffered pages see the same root
+    """
+    if _FULL_HTML.match(start):
+        return doc
+    body = doc.find("body")
+    if body is None or doc.find("head") is not None:
+        return doc
+    if (
+        len(body) == 1
+        and not (body.text or "").strip()
+        and not (body[-1].tail or "").strip()
+    ):
+        # a single element was passed in
+        return body[0]
+    block = any(
+        el.tag in lxml.html.defs.block_tags for el in body.iter(lxml.etree.Element)
+    )
+    body.tag = "div" if block else "span"
+    return body
+
+
+class _ChunkReader(io.RawIOBase):
+    """
+    file-like wrapper around an iterable of bytes, for parsers that only read files
+    """
+
+    def __init__(self, chunks: typing.Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: typing.Any) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _load_json(content: bytes) -> typing.Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # orjson only handles UTF-8, json also detects UTF-16/32
+            pass
+    return json.loads(content)
+
+
+def _pdftotext(content: bytes, preserve_layout: bool) -> str:
+    command = ["pdftotext"]
+    if preserve_layout:
+        command.append("-layout")
+    # read the PDF from stdin and write text to stdout, no temporary file needed
+    command += ["-", "-"]
+
+    try:
+        result = subprocess.run(
+            command,
+            input=content,
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+    except OSError as e:
+        raise EnvironmentError(f"error running pdftotext, missing executable? [{e}]")
+    return result.stdout.decode("utf8")
+
+
+def _csv_dicts(
+    reader: typing.Iterator[typing.List[str]],
+) -> typing.Iterator[typing.Dict[typing.Optional[str], typing.Any]]:
+    """
+    equivalent to csv.DictReader, without its per-row overhead for well-formed rows
+    """
+    fieldnames = next(reader, None)
+    if fieldnames is None:
+        return
+    num_fields = len(fieldnames)
+    for row in reader:
+        if not row:
+            continue
+        item: typing.Dict[typing.Optional[str], typing.Any] = dict(zip(fieldnames, row))
+        if len(row) > num_fields:
+            item[None] = row[num_fields:]
+        elif len(row) < num_fields:
+            for key in fieldnames[len(row) :]:
+                item[key] = None
+        yield item
+
+
+def _memoize_encoding(response: typing.Any) -> None:
+    """
+    requests re-runs charset detection on every .text access if the server didn't
+    declare an encoding, so detect it once for textual responses
+    """
+    if getattr(response, "encoding", True) is not None:
+        return
+    content_type = response.headers.get("content-type", "")
+    # JSON has its own detection in response.json(), binary types never need .text
+    if _TEXTUAL_CONTENT_TYPE.search(content_type):
+        response.encoding = response.apparent_encoding or "utf-8"
+
+
+def _declared_encoding(response: typing.Any) -> typing.Optional[str]:
+    """
+    only trust the response's encoding if the server explicitly declared a charset,
+    otherwise leave detection to libxml2 (which respects <meta charset>)
+    """
+    headers = getattr(response, "headers", None) or {}
+    content_type = headers.get("content-type", "")
+    if "charset=" in content_type.lower():
+        return getattr(response, "encoding", None)
+    return None
+
+
+def _decoding_encoding(response: typing.Any, streamed: bool) -> str:
+    """
+    encoding to decode the body with, falling back to utf-8 like requests does for
+    charsets Python doesn't know; detection is skipped for streamed responses since
+    apparent_encoding reads the whole body
+    """
+    encoding = response.encoding
+    if not encoding and not streamed:
+        encoding = response.apparent_encoding
+    if not encoding:
+        return "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return "utf-8"
+    return encoding
+
+
+def _dependency_key(
+    dep_class: type, input_val: typing.Any
+) -> typing.Optional[typing.Tuple]:
+    """
+    key for sharing a dependency's result between pages with equal input,
+    None if the input isn't hashable (e.g. non-frozen dataclasses)
+    """
+    key = (dep_class, input_val)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _dependency_results(
+    scraper: scrapelib.Scraper,
+) -> "collections.OrderedDict[typing.Tuple, typing.Any]":
+    """
+    results of class dependencies fetched with this scraper, keyed by (class, input),
+    least recently used first; must be called with _dependency_cache_lock held
+    """
+    results = getattr(scraper, "_spatula_dependency_results", None)
+    if results is None:
+        results = scraper._spatula_dependency_results = (  # type: ignore
+            collections.OrderedDict()
+        )
+    return results
+
+
+def _allows_concurrency(scraper: scrapelib.Scraper) -> bool:
+    """
+    scrapelib's throttling and SQLite cache aren't thread-safe, so only scrapers
+    using neither can be shared between threads
+    """
+    return not getattr(scraper, "cache_storage", None) and not getattr(
+        scraper, "requests_per_minute", 0
+    )
+
+
+def _resolve_dependency(dep: "Page", scraper: scrapelib.Scraper) -> typing.Any:
+    dep._fetch_data(scraper)
+    return dep.process_page()
+
 
 def _to_scout_result(result: typing.Any) -> typing.Dict[str, typing.Any]:
     _next: typing.Optional[str]
@@ -74,6 +395,7 @@ class Page:
     `response`
     :   [`requests.Response`](https://docs.python-requests.org/en/master/api/#requests.Response)
         object available if access is needed to the raw response for any reason.
+        Should be treated as read-only, `postprocess_response` parses directly from it.
 
     `input`
     :   Instance of data being passed upon instantiation of this page.
@@ -102,6 +424,10 @@ class Page:
         Means that before `EmployeeDetail.process_page` is called, it is guaranteed to have the
         output from `AwardsPage` available as `self.awards`.
 
+        When a dependency is given as a `Page` subclass, its result is shared by all
+        pages fetched with the same scraper and an equal (hashable) input, so it
+        must not be modified in place.
+
         See [Specifying Dependencies](advanced-techniques.md#specifying-dependencies) for
         a more detailed explanation.
 
@@ -111,6 +437,7 @@ class Page:
     source: typing.Union[None, str, Source] = None
     dependencies: typing.Dict[str, "Page"] = {}
     _cached_dependencies: typing.Dict[str, typing.Any] = {}
+    logger = logging.getLogger(__name__ + ".Page")
 
     def _fetch_data(self, scraper: scrapelib.Scraper) -> None:
         """
@@ -118,21 +445,64 @@ class Page:
         exactly once before process_page is invoked
         """
         # process dependencies first
+        pending: typing.Dict[
+            str, typing.Tuple["Page", bool, typing.Optional[typing.Tuple]]
+        ] = {}
         for key, dep in self.dependencies.items():
             use_cache = False
+            input_key = None
             if isinstance(dep, type):
-                dep = dep(self.input)
+                input_key = _dependency_key(dep, self.input)
             else:
                 use_cache = True
 
+            cached = _MISSING
+            if input_key is not None:
+                with _dependency_cache_lock:
+                    shared = _dependency_results(scraper)
+                    cached = shared.get(input_key, _MISSING)
+                    if cached is not _MISSING:
+                        shared.move_to_end(input_key)
+
             if key in self._cached_dependencies:
                 setattr(self, key, self._cached_dependencies[key])
+            elif cached is not _MISSING:
+                setattr(self, key, cached)
             else:
-                dep._fetch_data(scraper)
-                page_result = dep.process_page()
-                setattr(self, key, page_result)
-                if use_cache:
-                    self._cached_dependencies[key] = page_result
+                if isinstance(dep, type):
+                    dep = dep(self.input)
+                pending[key] = (dep, use_cache, input_key)
+
+        # dependencies are independent of one another, so fetch them concurrently
+        # when the scraper allows it
+        if len(pending) > 1 and _allows_concurrency(scraper):
+            with concurrent.futures.ThreadPoolExecutor(
+                min(len(pending), _MAX_DEPENDENCY_WORKERS)
+            ) as pool:
+                results = list(
+                    pool.map(
+                        lambda dep: _resolve_dependency(dep, scraper),
+                        [dep for dep, _, _ in pending.values()],
+                    )
+                )
+        else:
+            results = [
+                _resolve_dependency(dep, scraper) for dep, _, _ in pending.values()
+            ]
+
+        for (key, (dep, use_cache, input_key)), page_result in zip(
+            pending.items(), results
+        ):
+            setattr(self, key, page_result)
+            if use_cache:
+                self._cached_dependencies[key] = page_result
+            # generators can only be consumed once, so they can't be shared
+            if input_key is not None and not isinstance(page_result, typing.Generator):
+                with _dependency_cache_lock:
+                    shared = _dependency_results(scraper)
+                    shared[input_key] = page_result
+                    if len(shared) > _DEPENDENCY_CACHE_SIZE:
+                        shared.popitem(last=False)
 
         if not self.source:
             try:
@@ -145,16 +515,35 @@ class Page:
             self.source = URL(self.source)
         # at this point self.source is indeed a Source
         self.logger.info(f"fetching {self.source}")
+        http_cache = getattr(scraper, "http_cache", None)
         try:
-            self.response = self.source.get_response(scraper)  # type: ignore
+            if not http_cache or not isinstance(self.source, URL):
+                self.response = self.source.get_response(scraper)  # type: ignore
+            else:
+                self.response = http_cache.get_response(self.source, scraper)
             if getattr(self.response, "fromcache", None):
                 self.logger.debug(f"retrieved {self.source} from cache")
         except scrapelib.HTTPError as e:
             self.process_error_response(e)
             raise HandledError(e)
         else:
+            if not self._is_streamed():
+                _memoize_encoding(self.response)
             self.postprocess_response()
 
+    def _is_streamed(self) -> bool:
+        return getattr(self.source, "stream", False)
+
+    def _response_file(self) -> typing.BinaryIO:
+        """
+        file-like view of the response body, read incrementally if streamed
+        """
+        if self._is_streamed():
+            return io.BufferedReader(
+                _ChunkReader(self.response.iter_content(_CHUNK_SIZE))
+            )
+        return io.BytesIO(self.response.content)
+
     def _paginate(
         self, scraper: scrapelib.Scraper, scout: bool
     ) -> typing.Iterable[typing.Any]:
@@ -208,9 +597,12 @@ class Page:
         # allow possibility to override default source, useful during dev
         if source:
             self.source = source
-        self.logger = logging.getLogger(
-            self.__class__.__module__ + "." + self.__class__.__name__
-        )
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # one logger per class, instead of looking it up for every instance
+        if "logger" not in cls.__dict__:
+            cls.logger = logging.getLogger(cls.__module__ + "." + cls.__name__)
 
     def __str__(self) -> str:
         s = f"{self.__class__.__name__}("
@@ -231,7 +623,7 @@ class Page:
         :returns: Generator yielding results from the scrape.
         """
         if scraper is None:
-            scraper = scrapelib.Scraper()
+            scraper = _pooled_scraper()
         yield from self._to_items(scraper)
 
     def get_source_from_input(self) -> typing.Union[None, str, Source]:
@@ -287,11 +679,53 @@ class HtmlPage(Page):
 
         Can use the normal lxml methods (such as `cssselect` and `getchildren`), or
         use this element as the target of a `Selector` subclass.
+
+    `make_links_absolute`
+    :   set to `False` on derived class to skip rewriting every link on the page to
+        an absolute URL, which can be slow on very large pages.  Individual links can
+        then be resolved with `self.absolute(href)`.
+        (`True` by default)
     """
 
+    make_links_absolute = True
+
+    def absolute(self, href: str) -> str:
+        """
+        Resolve `href` relative to the URL this page was fetched from.
+        """
+        return urllib.parse.urljoin(getattr(self.source, "url", ""), href)
+
     def postprocess_response(self) -> None:
-        self.root = lxml.html.fromstring(self.response.content)
-        if hasattr(self.source, "url"):
+        streamed = self._is_streamed()
+        content = None if streamed else self.response.content
+        encoding = None
+        if streamed or isinstance(content, bytes):
+            encoding = _declared_encoding(self.response)
+        try:
+            parser = _get_html_parser(encoding)
+        except LookupError:
+            # libxml2 doesn't know the declared encoding, let it sniff instead
+            parser = _get_html_parser()
+        if streamed:
+            start = b""
+
+            def chunks() -> typing.Iterator[bytes]:
+                nonlocal start
+                for chunk in self.response.iter_content(_CHUNK_SIZE):
+                    # enough of the start to tell a full page from a fragment
+                    if len(start.lstrip()) < len(b"<!doctype"):
+                        start += chunk
+                    yield chunk
+
+            doc = _feed_parser(parser, chunks())
+            self.root = _html_fragment_root(doc, start)
+        else:
+            self.root = _cached_parse(
+                f"html:{encoding}",
+                content,
+                lambda: lxml.html.fromstring(content, parser=parser),
+            )
+        if self.make_links_absolute and hasattr(self.source, "url"):
             self.root.make_links_absolute(self.source.url)  # type: ignore
 
 
@@ -307,7 +741,14 @@ class XmlPage(Page):
     """
 
     def postprocess_response(self) -> None:
-        self.root = lxml.etree.fromstring(self.response.content)
+        parser = _get_xml_parser()
+        if self._is_streamed():
+            self.root = _feed_parser(parser, self.response.iter_content(_CHUNK_SIZE))
+        else:
+            content = self.response.content
+            self.root = _cached_parse(
+                "xml", content, lambda: lxml.etree.fromstring(content, parser)
+            )
 
 
 class JsonPage(Page):
@@ -318,13 +759,34 @@ class JsonPage(Page):
 
     `data`
     :   JSON data from response.  (same as `self.response.json()`)
+
+    `json_path`
+    :   Optional [ijson](https://pypi.org/project/ijson/) prefix (e.g. `"item"` for
+        each element of a top-level list, or `"results.item"`).  If set, the response is
+        parsed incrementally and `data` is an iterator over the objects found at that
+        path instead of the fully-parsed document.  Requires `ijson` to be installed.
     """
 
+    json_path: typing.Optional[str] = None
+
     def postprocess_response(self) -> None:
-        self.data = self.response.json()
+        if self.json_path:
+            if ijson is None:
+                raise ImportError("JsonPage.json_path requires ijson to be installed")
+            self.data = ijson.items(
+                self._response_file(), self.json_path, use_float=True
+            )
+        elif orjson is not None:
+            try:
+                self.data = orjson.loads(self.response.content)
+            except orjson.JSONDecodeError:
+                # orjson only handles UTF-8, let requests detect other encodings
+                self.data = self.response.json()
+        else:
+            self.data = self.response.json()
 
 
-class PdfPage(Page):  # pragma: no cover
+class PdfPage(Page):
     """
     Page that automatically handles converting a PDF response to text using `pdftotext`.
 
@@ -335,37 +797,54 @@ class PdfPage(Page):  # pragma: no cover
         -layout option to attempt to preserve the layout of text.
         (`False` by default)
 
+    `batch_extract`
+    :   set to `True` on derived class to skip conversion when the response is
+        fetched, so that many pages can be converted concurrently with `process_many`.
+        (`False` by default)
+
     `text`
     :   UTF8 text extracted by pdftotext.
     """
 
     preserve_layout = False
+    batch_extract = False
 
     def postprocess_response(self) -> None:
-        with tempfile.NamedTemporaryFile() as temp:
-            temp.write(self.response.content)
-            temp.flush()
-            temp.seek(0)
+        # with batch_extract, process_many does the (only) conversion
+        if not self.batch_extract:
+            self.text = _pdftotext(self.response.content, self.preserve_layout)
+
+    @classmethod
+    def process_many(
+        cls,
+        pages: typing.Iterable["PdfPage"],
+        max_workers: typing.Optional[int] = None,
+    ) -> typing.List["PdfPage"]:
+        """
+        Convert the responses of many already-fetched pages to text concurrently.
 
-            if self.preserve_layout:
-                command = ["pdftotext", "-layout", temp.name, "-"]
-            else:
-                command = ["pdftotext", temp.name, "-"]
+        Pages should set `batch_extract` so that fetching them doesn't already
+        convert each PDF one at a time.
 
-            try:
-                pipe = subprocess.Popen(
-                    command, stdout=subprocess.PIPE, close_fds=True
-                ).stdout
-            except OSError as e:
-                raise EnvironmentError(
-                    f"error running pdftotext, missing executable? [{e}]"
-                )
-            if pipe is None:
-                raise EnvironmentError("no stdout from pdftotext")
-            else:
-                data = pipe.read()
-                pipe.close()
-        self.text = data.decode("utf8")
+        Each conversion runs in its own `pdftotext` process, so up to `max_workers`
+        conversions are run at once.
+
+        :param pages: `PdfPage` instances that have `response` set.
+        :param max_workers: Maximum number of concurrent conversions,
+                            defaults to the number of CPUs.
+        :returns: List of the same pages, with `text` set.
+        """
+        pages = list(pages)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers or os.cpu_count()
+        ) as pool:
+            texts = pool.map(
+                lambda page: _pdftotext(page.response.content, page.preserve_layout),
+                pages,
+            )
+            for page, text in zip(pages, texts):
+                page.text = text
+        return pages
 
 
 class ListPage(Page):
@@ -387,11 +866,14 @@ class ListPage(Page):
     def _process_or_skip_loop(
         self, iterable: typing.Iterable
     ) -> typing.Iterable[typing.Any]:
+        # bound once up front, this loop runs for every row/element on the page
+        process_item = self.process_item
+        log = self.logger.info
         for item in iterable:
             try:
-                item = self.process_item(item)
+                item = process_item(item)
             except SkipItem as e:
-                self.logger.info(f"SkipItem: {e}")
+                log("SkipItem: %s", e)
                 continue
             yield item
 
@@ -413,27 +895,83 @@ class CsvListPage(ListPage):
     """
     Processes each row in a CSV (after the first, assumed to be headers) as an item
     with `process_item`.
+
+    **Attributes**
+
+    `columnar`
+    :   If `True`, the CSV is read with `pyarrow`'s multithreaded CSV reader into a
+        [`pyarrow.Table`](https://arrow.apache.org/docs/python/generated/pyarrow.Table.html)
+        available as `self.table`, and `process_item` is called with
+        `pyarrow.RecordBatch` objects of up to `batch_size` rows instead of a `dict`
+        per row.  Column types are inferred by `pyarrow`.
+        Requires `pyarrow` to be installed.  (`False` by default)
+
+    `batch_size`
+    :   Maximum number of rows per `RecordBatch` when `columnar` is set.
     """
 
+    columnar = False
+    batch_size = 1024
+
     def postprocess_response(self) -> None:
-        self.reader = csv.DictReader(io.StringIO(self.response.text))
+        encoding = _decoding_encoding(self.response, self._is_streamed())
+        if self.columnar:
+            if pyarrow is None:
+                raise ImportError(
+                    "CsvListPage.columnar requires pyarrow to be installed"
+                )
+            self.table = pyarrow.csv.read_csv(
+                self._response_file(),
+                read_options=pyarrow.csv.ReadOptions(
+                    use_threads=True, block_size=1 << 20, encoding=encoding
+                ),
+            )
+            return
+        # decode incrementally instead of building one large str via response.text
+        text = io.TextIOWrapper(
+            self._response_file(), encoding=encoding, errors="replace", newline=""
+        )
+        self.reader = _csv_dicts(csv.reader(text))
 
     def process_page(self) -> typing.Iterable[typing.Any]:
-        yield from self._process_or_skip_loop(self.reader)
+        if self.columnar:
+            batches = self.table.to_batches(max_chunksize=self.batch_size)
+            yield from self._process_or_skip_loop(batches)
+        else:
+            yield from self._process_or_skip_loop(self.reader)
 
 
-class ExcelListPage(ListPage):  # pragma: no cover
+class ExcelListPage(ListPage):
     """
     Processes each row in an Excel file as an item with `process_item`.
     """
 
     def postprocess_response(self) -> None:
-        workbook = load_workbook(io.BytesIO(self.response.content))
+        # read_only streams rows instead of materializing every cell up front
+        self.workbook = load_workbook(
+            io.BytesIO(self.response.content),
+            read_only=True,
+            data_only=True,
+            keep_links=False,
+        )
         # TODO: allow selecting this with a class property
-        self.worksheet = workbook.active
+        self.worksheet = self.workbook.active
+        # read-only mode stops at the sheet's stored dimensions, which some writers
+        # get wrong, so drop them and read every row; short rows are still padded
+        # to the stored width (recalculating it would take another pass over the
+        # whole sheet)
+        self._width = self.worksheet.max_column or 0
+        self.worksheet.reset_dimensions()
 
     def process_page(self) -> typing.Iterable[typing.Any]:
-        yield from self._process_or_skip_loop(self.worksheet.values)
+        try:
+            rows = self.worksheet.iter_rows(values_only=True)
+            if self._width:
+                padding = (None,) * self._width
+                rows = (row + padding[len(row) :] for row in rows)
+            yield from self._process_or_skip_loop(rows)
+        finally:
+            self.workbook.close()
 
 
 class LxmlListPage(ListPage):
@@ -448,13 +986,86 @@ class LxmlListPage(ListPage):
     """
 
     selector = None
+    iter_tag: typing.Optional[str] = None
+    iterparse = False
+
+    def _stream_tag(self) -> typing.Optional[str]:
+        if self.iter_tag:
+            return self.iter_tag
+        if self.iterparse and self.selector:
+            # only simple selectors (e.g. `XPath("//tr")`) can be matched while parsing
+            return self.selector._simple_tag()
+        return None
+
+    def postprocess_response(self) -> None:
+        # in streaming mode the document is parsed within process_page
+        if not self._stream_tag():
+            super().postprocess_response()
 
     def process_page(self) -> typing.Iterable[typing.Any]:
+        tag = self._stream_tag()
+        if tag:
+            yield from self._process_or_skip_loop(self._iterparse_items(tag))
+            return
         if not self.selector:
             raise NotImplementedError("must either provide selector or override scrape")
         items = self.selector.match(self.root)
         yield from self._process_or_skip_loop(items)
 
+    def _iterparse_items(self, tag: str) -> typing.Iterable[typing.Any]:
+        if isinstance(self, HtmlPage):
+            # the HTML parser lowercases all tag names
+            tag = tag.lower()
+            try:
+                parser = lxml.etree.HTMLPullParser(
+                    events=("end",), tag=tag, encoding=_declared_encoding(self.response)
+                )
+            except LookupError:
+                # libxml2 doesn't know the declared encoding, let it sniff instead
+                parser = lxml.etree.HTMLPullParser(events=("end",), tag=tag)
+            # so items have text_content() etc. as they would in a full tree
+            parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        else:
+            parser = lxml.etree.XMLPullParser(
+                events=("end",),
+                tag=tag,
+                collect_ids=False,
+                resolve_entities=False,
+                no_network=True,
+                huge_tree=False,
+            )
+        body = self._response_file()
+        count = 0
+        for chunk in iter(lambda: body.read(_CHUNK_SIZE), b""):
+            parser.feed(chunk)
+            for item in _complete_items(parser, tag):
+                count += 1
+                yield item
+        root = parser.close()
+        for item in _complete_items(parser, tag):
+            count += 1
+            yield item
+
+        if self.selector and not self.iter_tag:
+            self.selector._check_count(count, root)
+
+
+def _complete_items(parser: typing.Any, tag: str) -> typing.Iterable[typing.Any]:
+    """
+    items from a pull parser's end events, in document order
+
+    an item nested within another item is yielded after its outermost ancestor
+    item ends, so that no item is cleared before all of its content has been seen
+    """
+    for _, elem in parser.read_events():
+        if next(elem.iterancestors(tag), None) is not None:
+            continue
+        yield from elem.iter(tag)
+        # drop processed elements so memory is O(depth) instead of O(document)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
 
 class HtmlListPage(LxmlListPage, HtmlPage):
     """
@@ -464,6 +1075,22 @@ class HtmlListPage(LxmlListPage, HtmlPage):
 
     `selector`
     :   `Selector` subclass which matches list of homogenous elements to process.  (e.g. `CSS("tbody tr")`)
+
+    `iterparse`
+    :   set to `True` on derived class to match elements while the document is being
+        parsed instead of building the full tree first, if `selector` is a simple tag
+        selector such as `CSS("tr")` or `XPath("//tr")`.  Other selectors fall back to
+        the normal behavior.  (`False` by default)
+
+        Elements are cleared once processed, so `process_item` should only rely on
+        the element itself.  `self.root` is never set in this mode, so
+        `get_next_source` can't paginate from it.  Links are not made absolute in
+        this mode, use `self.absolute(href)`.  `selector`'s item count constraints
+        are checked once the whole document has been parsed, after all items were
+        processed.
+
+    `iter_tag`
+    :   Tag to stream, implies `iterparse` and takes precedence over `selector`.
     """
 
     pass
@@ -477,6 +1104,24 @@ class XmlListPage(LxmlListPage, XmlPage):
 
     `selector`
     :   `Selector` subclass which matches list of homogenous elements to process.  (e.g. `XPath("//item")`)
+
+    `iter_tag`
+    :   If set, the document is streamed with `lxml.etree.XMLPullParser` instead of
+        being parsed into a full tree, and each element with this tag (e.g. `"item"` or
+        `"{http://example.com/ns}item"`) is passed to `process_item` as soon as it has
+        been parsed (an element nested within another one is passed on after it, in
+        document order).  `selector` is not used and `self.root` is never set in
+        this mode, so `get_next_source` can't paginate from it.
+
+        Elements are cleared once processed to keep memory use bounded, so
+        `process_item` should extract everything it needs from the element itself
+        and not rely on its siblings or ancestors.
+
+    `iterparse`
+    :   set to `True` on derived class to stream as with `iter_tag`, using the tag
+        from `selector` if it is a simple tag selector such as `XPath("//item")`.
+        `selector`'s item count constraints are checked once the whole document has
+        been parsed.  (`False` by default)
     """
 
     pass
@@ -485,7 +1130,58 @@ class XmlListPage(LxmlListPage, XmlPage):
 class JsonListPage(ListPage, JsonPage):
     """
     Processes each element in a JSON list as an item with `process_item`.
+
+    For very large lists, set `json_path = "item"` to start processing items
+    before the entire response has been parsed.
+
+    **Attributes**
+
+    `columnar`
+    :   If `True`, the response (a JSON array of objects, or newline-delimited JSON
+        objects) is read into a
+        [`pyarrow.Table`](https://arrow.apache.org/docs/python/generated/pyarrow.Table.html)
+        available as `self.table`, and `process_item` is called with
+        `pyarrow.RecordBatch` objects of up to `batch_size` rows instead of individual
+        elements.  Requires `pyarrow` to be installed.  (`False` by default)
+
+    `batch_size`
+    :   Maximum number of rows per `RecordBatch` when `columnar` is set.
     """
 
+    columnar = False
+    batch_size = 1024
+
+    def postprocess_response(self) -> None:
+        if self.columnar:
+            if pyarrow is None:
+                raise ImportError(
+                    "JsonListPage.columnar requires pyarrow to be installed"
+                )
+            body = self._response_file()
+            # read up to the first significant byte, however much whitespace precedes it
+            start = b""
+            while True:
+                chunk = body.read(_CHUNK_SIZE)
+                start += chunk
+                if start.startswith(codecs.BOM_UTF8):
+                    start = start[len(codecs.BOM_UTF8) :]
+                if not chunk or start.lstrip():
+                    break
+            # pyarrow only reads JSON Lines, so a JSON array is parsed up front
+            if start.lstrip()[:1] == b"[":
+                rows = _load_json(start + body.read())
+                self.table = pyarrow.Table.from_pylist(rows)
+            else:
+                rest = iter(lambda: body.read(_CHUNK_SIZE), b"")
+                self.table = pyarrow.json.read_json(
+                    io.BufferedReader(_ChunkReader(itertools.chain([start], rest)))
+                )
+        else:
+            super().postprocess_response()
+
     def process_page(self) -> typing.Iterable[typing.Any]:
-        yield from self._process_or_skip_loop(self.data)
+        if self.columnar:
+            batches = self.table.to_batches(max_chunksize=self.batch_size)
+            yield from self._process_or_skip_loop(batches)
+        else:
+            yield from self._process_or_skip_loop(self.data)
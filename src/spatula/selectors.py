@@ -1,8 +1,16 @@
 import re
-from typing import Optional, List, Iterator
+from typing import Dict, Optional, List, Iterator
+import lxml.etree  # type: ignore
 from lxml.etree import _Element  # type: ignore
+from lxml.html import HtmlElement  # type: ignore
+from lxml.cssselect import CSSSelector  # type: ignore
 from .utils import _display
 
+_ALL_LINKS = lxml.etree.XPath("//a")
+# selectors that match all elements with a given tag, e.g. //tr or tr
+_SIMPLE_XPATH = re.compile(r"^//([A-Za-z_][\w.-]*)$")
+_SIMPLE_CSS = re.compile(r"^\s*([A-Za-z_][\w-]*)\s*$")
+
 
 class SelectorError(ValueError):
     """
@@ -49,28 +57,44 @@ class Selector:
         :param num_items: An exact number of items to match.
         """
         items = list(self.get_items(element))
+        self._check_count(
+            len(items),
+            element,
+            min_items=min_items,
+            max_items=max_items,
+            num_items=num_items,
+        )
+        return items
+
+    def _check_count(
+        self,
+        count: int,
+        element: _Element,
+        *,
+        min_items: Optional[int] = None,
+        max_items: Optional[int] = None,
+        num_items: Optional[int] = None,
+    ) -> None:
         num_items = self.num_items if num_items is None else num_items
         max_items = self.max_items if max_items is None else max_items
         min_items = self.min_items if min_items is None else min_items
 
-        if num_items is not None and len(items) != num_items:
+        if num_items is not None and count != num_items:
             raise SelectorError(
-                f"{self} on {_display(element)} got {len(items)} results, "
+                f"{self} on {_display(element)} got {count} results, "
                 f"expected {num_items}"
             )
-        if min_items is not None and len(items) < min_items:
+        if min_items is not None and count < min_items:
             raise SelectorError(
-                f"{self} on {_display(element)} got {len(items)} results, "
+                f"{self} on {_display(element)} got {count} results, "
                 f"expected at least {min_items}"
             )
-        if max_items is not None and len(items) > max_items:
+        if max_items is not None and count > max_items:
             raise SelectorError(
-                f"{self} on {_display(element)} got {len(items)} results, "
+                f"{self} on {_display(element)} got {count} results, "
                 f"expected at most {max_items}"
             )
 
-        return items
-
     def match_one(self, element: _Element) -> _Element:
         """
         Return exactly one match.
@@ -82,6 +106,13 @@ class Selector:
     def get_items(self, element: _Element) -> Iterator[_Element]:  # pragma: no cover
         raise NotImplementedError()
 
+    def _simple_tag(self) -> Optional[str]:
+        """
+        tag name if this selector matches every element with a given tag and nothing
+        else, allowing it to be evaluated while the document is being parsed
+        """
+        return None
+
 
 class XPath(Selector):
     def __init__(
@@ -102,9 +133,17 @@ class XPath(Selector):
         """
         super().__init__(min_items=min_items, max_items=max_items, num_items=num_items)
         self.xpath = xpath
+        self._compiled: Optional[lxml.etree.XPath] = None
 
     def get_items(self, element: _Element) -> Iterator[_Element]:
-        yield from element.xpath(self.xpath)
+        # compile once on first use, selectors are typically shared by every page
+        if self._compiled is None:
+            self._compiled = lxml.etree.XPath(self.xpath)
+        yield from self._compiled(element)
+
+    def _simple_tag(self) -> Optional[str]:
+        match = _SIMPLE_XPATH.match(self.xpath)
+        return match.group(1) if match else None
 
     def __str__(self) -> str:  # pragma: no cover
         return f"XPath({self.xpath})"
@@ -132,7 +171,7 @@ class SimilarLink(Selector):
 
     def get_items(self, element: _Element) -> Iterator[_Element]:
         seen = set()
-        for element in element.xpath("//a"):
+        for element in _ALL_LINKS(element):
             href = element.get("href")
             if (
                 href
@@ -165,9 +204,20 @@ class CSS(Selector):
         """
         super().__init__(min_items=min_items, max_items=max_items, num_items=num_items)
         self.css_selector = css_selector
+        self._compiled: Dict[str, CSSSelector] = {}
 
     def get_items(self, element: _Element) -> Iterator[_Element]:
-        yield from element.cssselect(self.css_selector)
+        # match element.cssselect, which translates differently for HTML and XML
+        translator = "html" if isinstance(element, HtmlElement) else "xml"
+        if translator not in self._compiled:
+            self._compiled[translator] = CSSSelector(
+                self.css_selector, translator=translator
+            )
+        yield from self._compiled[translator](element)
+
+    def _simple_tag(self) -> Optional[str]:
+        match = _SIMPLE_CSS.match(self.css_selector)
+        return match.group(1) if match else None
 
     def __str__(self) -> str:  # pragma: no cover
         return f"CSS({self.css_selector})"
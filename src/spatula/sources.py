@@ -1,6 +1,26 @@
-from typing import Optional
+import json
+import sqlite3
+import threading
+import typing
+from typing import Dict, Optional
 import requests
 import scrapelib
+from requests.adapters import HTTPAdapter
+
+# number of hosts to keep connection pools for, and connections kept per host
+_POOL_SIZE = 100
+
+
+def _pooled_scraper(**kwargs: typing.Any) -> scrapelib.Scraper:
+    """
+    scrapelib.Scraper that keeps connections alive for more hosts than the requests
+    default (10), so TCP/TLS connections are reused across a wide scrape
+    """
+    scraper = scrapelib.Scraper(**kwargs)
+    adapter = HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE)
+    scraper.mount("http://", adapter)
+    scraper.mount("https://", adapter)
+    return scraper
 
 
 class Source:
@@ -9,7 +29,13 @@ class Source:
 
 class URL(Source):
     def __init__(
-        self, url: str, method: str = "GET", data: dict = None, headers: dict = None, verify: bool = True
+        self,
+        url: str,
+        method: str = "GET",
+        data: dict = None,
+        headers: dict = None,
+        verify: bool = True,
+        stream: bool = False,
     ):
         """
         Defines a resource to fetch via URL, particularly useful for handling non-GET
@@ -20,6 +46,8 @@ class URL(Source):
         :param data: POST data to include in request body.
         :param headers: dictionary of HTTP headers to set for the request.
         :param verify: bool indicating whether or not to verify SSL certificates for request, defaults to True
+        :param stream: bool indicating whether the response body should be streamed into the page's parser
+                       instead of being read into memory first, defaults to False
         """
 
         self.url = url
@@ -27,12 +55,18 @@ class URL(Source):
         self.data = data
         self.headers = headers
         self.verify = verify
+        self.stream = stream
 
     def get_response(
         self, scraper: scrapelib.Scraper
     ) -> Optional[requests.models.Response]:
         return scraper.request(
-            method=self.method, url=self.url, data=self.data, headers=self.headers, verify=self.verify
+            method=self.method,
+            url=self.url,
+            data=self.data,
+            headers=self.headers,
+            verify=self.verify,
+            stream=self.stream,
         )
 
     def __str__(self) -> str:
@@ -52,3 +86,95 @@ class NullSource(Source):
 
     def __str__(self) -> str:
         return self.__class__.__name__
+
+
+class ConditionalCache:
+    def __init__(self, cache_path: str):
+        """
+        SQLite-backed store of response bodies along with their `ETag` and
+        `Last-Modified` validators.
+
+        When set as a scraper's `http_cache`, URLs that have been fetched before are
+        requested with `If-None-Match`/`If-Modified-Since` headers, and a
+        `304 Not Modified` response is answered from the cache without downloading
+        the body again.  `URL`s with `stream=True` bypass the cache, since storing
+        the body would mean reading all of it before it could be parsed.
+
+        :param cache_path: path for SQLite database file
+        """
+        self.cache_path = cache_path
+        # the connection is shared by every thread the scraper is used from
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache
+                    (url text PRIMARY KEY, etag text, last_modified text,
+                     encoding text, headers text, content blob)"""
+            )
+
+    def get_response(
+        self, source: URL, scraper: scrapelib.Scraper
+    ) -> Optional[requests.models.Response]:
+        # storing a body means reading all of it, which would defeat streaming
+        if source.method.upper() != "GET" or source.stream:
+            return source.get_response(scraper)
+
+        with self._lock:
+            rec = self._conn.execute(
+                "SELECT etag, last_modified, encoding, headers, content "
+                "FROM cache WHERE url=?",
+                (source.url,),
+            ).fetchone()
+        if rec is None:
+            response = source.get_response(scraper)
+        else:
+            etag, last_modified, encoding, headers, content = rec
+            validators: Dict[str, str] = {}
+            if etag:
+                validators["If-None-Match"] = etag
+            if last_modified:
+                validators["If-Modified-Since"] = last_modified
+            conditional = URL(
+                source.url,
+                method=source.method,
+                data=source.data,
+                headers={**(source.headers or {}), **validators},
+                verify=source.verify,
+                stream=source.stream,
+            )
+            response = conditional.get_response(scraper)
+            if response is not None and response.status_code == 304:
+                cached = requests.models.Response()
+                cached._content = content
+                # so iter_content() yields the stored body instead of reading raw
+                cached._content_consumed = True  # type: ignore
+                cached.status_code = 200
+                cached.encoding = encoding
+                cached.headers = requests.structures.CaseInsensitiveDict(
+                    json.loads(headers)
+                )
+                cached.url = source.url
+                cached.fromcache = True  # type: ignore
+                return cached
+
+        if response is not None and response.status_code == 200:
+            self._set(source.url, response)
+        return response
+
+    def _set(self, url: str, response: requests.models.Response) -> None:
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        # nothing to revalidate with, so no point in storing the body
+        if not etag and not last_modified:
+            return
+        rec = (
+            url,
+            etag,
+            last_modified,
+            response.encoding,
+            json.dumps(dict(response.headers)),
+            response.content,
+        )
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO cache VALUES (?,?,?,?,?,?)", rec)
@@ -1,4 +1,6 @@
 import logging
+import threading
+import concurrent.futures
 import pytest
 from spatula import (
     Page,
@@ -44,6 +46,7 @@ def test_page_init_and_str():
         == f"DummyPage(input={INPUT} source={SOURCE})"
     )
     assert DummyPage().logger == logging.getLogger("tests.test_page_base.DummyPage")
+    assert Page().logger == logging.getLogger("spatula.pages.Page")
 
 
 def test_fetch_data_dependencies():
@@ -62,6 +65,147 @@ def test_fetch_data_dependencies():
     assert p.a_dependency == "dependency fulfilled"
 
 
+def test_fetch_data_multiple_dependencies():
+    class InputDependencyPage(Page):
+        def get_source_from_input(self):
+            return f"{SOURCE}/{self.input}"
+
+        def process_page(self):
+            return self.response
+
+    class FirstDependencyPage(InputDependencyPage):
+        pass
+
+    class SecondDependencyPage(InputDependencyPage):
+        def process_page(self):
+            return self.response.upper()
+
+    class DependencyTestPage(Page):
+        source = SOURCE
+        dependencies = {"first": FirstDependencyPage, "second": SecondDependencyPage}
+
+    p = DependencyTestPage("dep")
+    p._fetch_data(DummyScraper())
+    assert p.first == f"dummy response for {SOURCE}/dep"
+    assert p.second == f"dummy response for {SOURCE}/dep".upper()
+
+
+class ThreadRecordingScraper(DummyScraper):
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+        self.threads = set()
+
+    def request(self, url, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().request(url, **kwargs)
+
+
+def _many_dependencies_page():
+    class InputDependencyPage(Page):
+        def get_source_from_input(self):
+            return f"{SOURCE}/{type(self).__name__}"
+
+        def process_page(self):
+            return self.response
+
+    class a(InputDependencyPage):
+        pass
+
+    class b(InputDependencyPage):
+        pass
+
+    class c(InputDependencyPage):
+        pass
+
+    class ManyDependenciesPage(Page):
+        source = SOURCE
+        dependencies = {"a": a, "b": b, "c": c}
+
+    return ManyDependenciesPage()
+
+
+def test_fetch_data_dependencies_throttled_scraper():
+    scraper = ThreadRecordingScraper(requests_per_minute=30, cache_storage=None)
+    p = _many_dependencies_page()
+    p._fetch_data(scraper)
+    assert p.b == f"dummy response for {SOURCE}/b"
+    # throttling isn't thread-safe, so all requests stay on this thread
+    assert scraper.threads == {threading.get_ident()}
+
+
+def test_fetch_data_dependencies_cached_scraper():
+    scraper = ThreadRecordingScraper(requests_per_minute=0, cache_storage=object())
+    _many_dependencies_page()._fetch_data(scraper)
+    assert scraper.threads == {threading.get_ident()}
+
+
+def test_fetch_data_dependencies_unthrottled_scraper():
+    scraper = ThreadRecordingScraper(requests_per_minute=0, cache_storage=None)
+    p = _many_dependencies_page()
+    p._fetch_data(scraper)
+    assert p.c == f"dummy response for {SOURCE}/c"
+    # dependencies ran on worker threads
+    assert len(scraper.threads) > 1
+
+
+def test_fetch_data_dependency_shared_by_input():
+    class CountingDependencyPage(Page):
+        source = SOURCE
+        fetched = 0
+
+        def process_page(self):
+            CountingDependencyPage.fetched += 1
+            return self.input
+
+    class DependencyTestPage(Page):
+        source = SOURCE
+        dependencies = {"dep": CountingDependencyPage}
+
+    scraper = DummyScraper()
+    for input_val in ["a", "b", "a", "a"]:
+        p = DependencyTestPage(input_val)
+        p._fetch_data(scraper)
+        assert p.dep == input_val
+    assert CountingDependencyPage.fetched == 2
+
+    # unhashable input, can't be shared
+    for _ in range(2):
+        p = DependencyTestPage({"unhashable": True})
+        p._fetch_data(scraper)
+    assert CountingDependencyPage.fetched == 4
+
+    # results aren't shared with pages fetched by another scraper
+    p = DependencyTestPage("a")
+    p._fetch_data(DummyScraper())
+    assert CountingDependencyPage.fetched == 5
+
+
+def test_fetch_data_dependency_shared_from_threads(monkeypatch):
+    monkeypatch.setattr("spatula.pages._DEPENDENCY_CACHE_SIZE", 2)
+
+    class NoneDependencyPage(Page):
+        source = SOURCE
+
+        def process_page(self):
+            return None if self.input % 2 else self.input
+
+    class DependencyTestPage(Page):
+        source = SOURCE
+        dependencies = {"dep": NoneDependencyPage}
+
+    scraper = DummyScraper()
+
+    def fetch(input_val):
+        p = DependencyTestPage(input_val)
+        p._fetch_data(scraper)
+        return p.dep
+
+    # constant eviction while other threads read the cache
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(fetch, [n % 5 for n in range(500)]))
+    assert results == [None if n % 2 else n for n in (n % 5 for n in range(500))]
+
+
 def test_get_source_from_input_called():
     class SimpleInputPage(Page):
         def get_source_from_input(self):
@@ -84,6 +228,27 @@ def test_fetch_data_sets_response():
     assert p.response == f"dummy response for {SOURCE}"
 
 
+def test_fetch_data_memoizes_encoding():
+    class XmlResponse:
+        headers = {"content-type": "application/xml"}
+        encoding = None
+        detected = 0
+
+        @property
+        def apparent_encoding(self):
+            self.detected += 1
+            return "ascii"
+
+    class XmlScraper:
+        def request(self, url, **kwargs):
+            return XmlResponse()
+
+    p = DummyPage(source=SOURCE)
+    p._fetch_data(XmlScraper())
+    assert p.response.encoding == "ascii"
+    assert p.response.detected == 1
+
+
 def test_fetch_data_handle_error_response():
     class ErrorPage(Page):
         _error_was_called = False
@@ -1,15 +1,26 @@
+import csv
+import io
 import json
+import re
+import zipfile
+import lxml.html
+import openpyxl
+import pytest
 from dataclasses import dataclass
 from spatula import (
     HtmlPage,
     XmlPage,
     JsonPage,
     CsvListPage,
+    ExcelListPage,
+    PdfPage,
     HtmlListPage,
     XmlListPage,
     JsonListPage,
     XPath,
+    CSS,
     URL,
+    SelectorError,
 )
 
 SOURCE = "https://example.com"
@@ -18,6 +29,7 @@ SOURCE = "https://example.com"
 @dataclass
 class Response:
     content: bytes
+    encoding: str = "utf-8"
 
     @property
     def text(self):
@@ -26,6 +38,10 @@ class Response:
     def json(self):
         return json.loads(self.content)
 
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), 4):
+            yield self.content[i : i + 4]
+
 
 def test_html_page():
     p = HtmlPage(source=URL(SOURCE))
@@ -37,6 +53,90 @@ def test_html_page():
     assert link.get("href") == "https://example.com/test"
 
 
+def test_html_page_relative_links():
+    class RelativeLinksPage(HtmlPage):
+        make_links_absolute = False
+
+    p = RelativeLinksPage(source=URL(SOURCE + "/dir/"))
+    p.response = Response(b"<html><a href='test'>link</a></html>")
+    p.postprocess_response()
+    href = p.root.xpath("//a")[0].get("href")
+    assert href == "test"
+    assert p.absolute(href) == "https://example.com/dir/test"
+
+
+def test_html_page_parse_cache(monkeypatch):
+    monkeypatch.setenv("SPATULA_PARSE_CACHE", "1")
+    parses = []
+    real_fromstring = lxml.html.fromstring
+
+    def counting_fromstring(*args, **kwargs):
+        parses.append(args)
+        return real_fromstring(*args, **kwargs)
+
+    monkeypatch.setattr(lxml.html, "fromstring", counting_fromstring)
+    content = b"<html><a href='/parse-cache'>link</a></html>"
+    pages = []
+    for source in ("https://example.com", "https://example.org", SOURCE):
+        p = HtmlPage(source=URL(source))
+        p.response = Response(content)
+        p.postprocess_response()
+        pages.append(p)
+
+    # parsed when first seen, again when seen twice to keep a copy, then reused
+    assert len(parses) == 2
+    assert pages[1].root is not pages[2].root
+    # each copy has links resolved against its own source
+    assert pages[0].root.xpath("//a")[0].get("href") == (
+        "https://example.com/parse-cache"
+    )
+    assert pages[1].root.xpath("//a")[0].get("href") == (
+        "https://example.org/parse-cache"
+    )
+    assert pages[2].root.xpath("//a")[0].get("href") == (
+        "https://example.com/parse-cache"
+    )
+
+
+def test_html_page_declared_encoding():
+    p = HtmlPage(source=URL(SOURCE))
+    p.response = Response("<html><p>caf\xe9</p></html>".encode("latin1"))
+    p.response.headers = {"content-type": "text/html; charset=ISO-8859-1"}
+    p.response.encoding = "ISO-8859-1"
+    p.postprocess_response()
+    assert p.root.xpath("//p/text()") == ["caf\xe9"]
+
+
+def test_html_page_streamed():
+    p = HtmlPage(source=URL(SOURCE, stream=True))
+    p.response = Response(b"<html><a href='/test'>link</a></html>")
+    p.postprocess_response()
+    link = p.root.xpath("//a")[0]
+    assert link.get("href") == "https://example.com/test"
+
+
+@pytest.mark.parametrize(
+    "content,tag",
+    [
+        (b"<html><body><p>hi</p></body></html>", "html"),
+        (b"  <!DOCTYPE html><p>hi</p>", "html"),
+        (b"<p>hi</p>", "p"),
+        (b"<p>one</p><p>two</p>", "div"),
+        (b"<b>one</b> two", "span"),
+        (b"<title>t</title><p>hi</p>", "html"),
+    ],
+)
+def test_html_page_streamed_matches_buffered(content, tag):
+    roots = []
+    for source in (URL(SOURCE), URL(SOURCE, stream=True)):
+        p = HtmlPage(source=source)
+        p.response = Response(content)
+        p.postprocess_response()
+        roots.append(p.root)
+    assert roots[0].tag == roots[1].tag == tag
+    assert lxml.html.tostring(roots[0]) == lxml.html.tostring(roots[1])
+
+
 def test_xml_page():
     p = XmlPage(source=SOURCE)
     p.response = Response(b"<data><is><nested /></is></data>")
@@ -44,6 +144,24 @@ def test_xml_page():
     assert p.root.tag == "data"
 
 
+def test_xml_page_no_external_entities(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    doctype = f'<!DOCTYPE data [<!ENTITY xxe SYSTEM "file://{secret}">]>'
+    p = XmlPage(source=SOURCE)
+    p.response = Response(f"{doctype}<data>&xxe;</data>".encode())
+    p.postprocess_response()
+    assert "secret" not in (p.root.text or "")
+
+
+def test_xml_page_streamed():
+    p = XmlPage(source=URL(SOURCE, stream=True))
+    p.response = Response(b"<data><is><nested /></is></data>")
+    p.postprocess_response()
+    assert p.root.tag == "data"
+    assert p.root.xpath("//nested")
+
+
 def test_json_page():
     nested = {"data": {"is": "nested"}}
     p = JsonPage(source=SOURCE)
@@ -52,15 +170,184 @@ def test_json_page():
     assert p.data == nested
 
 
+def test_json_page_non_utf8():
+    nested = {"data": {"is": "n\xe9sted"}}
+    p = JsonPage(source=SOURCE)
+    p.response = Response(json.dumps(nested, ensure_ascii=False).encode("utf-16"))
+    p.response.json = lambda: json.loads(p.response.content.decode("utf-16"))
+    p.postprocess_response()
+    assert p.data == nested
+
+
+def test_json_page_json_path():
+    pytest.importorskip("ijson")
+    p = JsonPage(source=URL(SOURCE, stream=True))
+    p.json_path = "results.item"
+    p.response = Response(json.dumps({"results": [{"a": 1}, {"a": 2.5}]}).encode())
+    p.postprocess_response()
+    assert list(p.data) == [{"a": 1}, {"a": 2.5}]
+
+
+class FakePdfToText:
+    """stands in for subprocess.run, 'converting' by upper-casing the input"""
+
+    def __init__(self):
+        self.commands = []
+
+    def __call__(self, command, input, **kwargs):
+        self.commands.append(command)
+
+        class Result:
+            stdout = input.upper()
+
+        return Result()
+
+
+def test_pdf_page(monkeypatch):
+    fake = FakePdfToText()
+    monkeypatch.setattr("spatula.pages.subprocess.run", fake)
+
+    class LayoutPdfPage(PdfPage):
+        preserve_layout = True
+
+    p = PdfPage(source=SOURCE)
+    p.response = Response(b"text")
+    p.postprocess_response()
+    assert p.text == "TEXT"
+
+    p = LayoutPdfPage(source=SOURCE)
+    p.response = Response(b"layout")
+    p.postprocess_response()
+    assert p.text == "LAYOUT"
+    assert fake.commands == [
+        ["pdftotext", "-", "-"],
+        ["pdftotext", "-layout", "-", "-"],
+    ]
+
+
+def test_pdf_page_missing_executable(monkeypatch):
+    def missing(*args, **kwargs):
+        raise FileNotFoundError("pdftotext")
+
+    monkeypatch.setattr("spatula.pages.subprocess.run", missing)
+    p = PdfPage(source=SOURCE)
+    p.response = Response(b"text")
+    with pytest.raises(EnvironmentError, match="missing executable"):
+        p.postprocess_response()
+
+
+def test_pdf_page_process_many(monkeypatch):
+    fake = FakePdfToText()
+    monkeypatch.setattr("spatula.pages.subprocess.run", fake)
+
+    class BatchPdfPage(PdfPage):
+        batch_extract = True
+
+    pages = []
+    for i in range(5):
+        p = BatchPdfPage(source=SOURCE)
+        p.response = Response(f"pdf {i}".encode())
+        p.postprocess_response()
+        assert not hasattr(p, "text")
+        pages.append(p)
+    assert fake.commands == []
+
+    assert BatchPdfPage.process_many(pages, max_workers=2) == pages
+    assert [p.text for p in pages] == [f"PDF {i}" for i in range(5)]
+    assert len(fake.commands) == 5
+
+
 def test_csv_list_page():
     p = CsvListPage(source=SOURCE)
-    p.response = Response("a,b,c\n1,2,3\n4,5,6")
+    p.response = Response(b"a,b,c\n1,2,3\n4,5,6")
     p.postprocess_response()
     data = list(p.process_page())
     assert len(data) == 2
     assert data[0] == {"a": "1", "b": "2", "c": "3"}
 
 
+def test_csv_list_page_matches_dictreader():
+    content = 'a,b,c\r\n1,"two\r\nlines",3\r\n\r\n4,5\r\n6,7,8,9\r\n\xe9,,'
+    p = CsvListPage(source=SOURCE)
+    p.response = Response(content.encode("latin1"), encoding="latin1")
+    p.postprocess_response()
+    data = list(p.process_page())
+    assert data == list(csv.DictReader(io.StringIO(content, newline="")))
+    assert data[1] == {"a": "4", "b": "5", "c": None}
+    assert data[2] == {"a": "6", "b": "7", "c": "8", None: ["9"]}
+
+
+def test_csv_list_page_unknown_charset():
+    p = CsvListPage(source=SOURCE)
+    p.response = Response("a,b\n\xe9,2".encode("utf-8"), encoding="x-unknown-cs")
+    p.postprocess_response()
+    assert list(p.process_page()) == [{"a": "\xe9", "b": "2"}]
+
+
+def test_csv_list_page_streamed_no_charset():
+    class StreamedResponse(Response):
+        @property
+        def apparent_encoding(self):
+            raise AssertionError("streamed body read for charset detection")
+
+    p = CsvListPage(source=URL(SOURCE, stream=True))
+    p.response = StreamedResponse(b"a,b\n1,2", encoding=None)
+    p.postprocess_response()
+    assert list(p.process_page()) == [{"a": "1", "b": "2"}]
+
+
+def test_csv_list_page_columnar():
+    pytest.importorskip("pyarrow")
+
+    class ColumnarCsvListPage(CsvListPage):
+        columnar = True
+        batch_size = 2
+
+        def process_item(self, batch):
+            return batch.column("b").to_pylist()
+
+    p = ColumnarCsvListPage(source=SOURCE)
+    p.response = Response(b"a,b\n1,2\n3,4\n5,6\n")
+    p.postprocess_response()
+    assert p.table.column_names == ["a", "b"]
+    assert list(p.process_page()) == [[2, 4], [6]]
+
+
+def test_excel_list_page_wrong_dimensions():
+    workbook = openpyxl.Workbook()
+    for row in [["a", "b"], [1, 2], [3, None], [5, 6]]:
+        workbook.active.append(row)
+    saved = io.BytesIO()
+    workbook.save(saved)
+
+    # rewrite the stored dimensions to cover only the first two rows
+    original = zipfile.ZipFile(saved)
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w") as rewritten:
+        for name in original.namelist():
+            data = original.read(name)
+            if name == "xl/worksheets/sheet1.xml":
+                data = re.sub(
+                    rb'<dimension ref="[^"]*"/>', b'<dimension ref="A1:B2"/>', data
+                )
+            rewritten.writestr(name, data)
+
+    p = ExcelListPage(source=SOURCE)
+    p.response = Response(content.getvalue())
+    p.postprocess_response()
+    data = list(p.process_page())
+    assert data == [("a", "b"), (1, 2), (3, None), (5, 6)]
+
+
+def test_excel_list_page_empty():
+    saved = io.BytesIO()
+    openpyxl.Workbook().save(saved)
+    p = ExcelListPage(source=SOURCE)
+    p.response = Response(saved.getvalue())
+    p.postprocess_response()
+    assert list(p.process_page()) == []
+
+
 def test_html_list_page():
     p = HtmlListPage(source=SOURCE)
     p.selector = XPath("//li/text()")
@@ -71,6 +358,88 @@ def test_html_list_page():
     assert data == ["one", "two", "three"]
 
 
+def test_html_list_page_iterparse():
+    class IterHtmlListPage(HtmlListPage):
+        selector = CSS("LI")
+        iterparse = True
+
+        def process_item(self, item):
+            return item.text
+
+    p = IterHtmlListPage(source=SOURCE)
+    p.response = Response(b"<ul><li>one</li><li>two</li><li>three</li></ul>")
+    p.postprocess_response()
+    assert not hasattr(p, "root")
+    assert list(p.process_page()) == ["one", "two", "three"]
+
+
+def test_html_list_page_iterparse_matches_tree():
+    content = (
+        b"<ul><li>one <b>1</b></li>"
+        b"<li>two<ul><li>nested</li><li>more <i>2</i></li></ul></li>"
+        b"<li>three</li></ul>"
+    )
+
+    class TreeHtmlListPage(HtmlListPage):
+        selector = CSS("li")
+
+        def process_item(self, item):
+            return item.text_content()
+
+    class IterHtmlListPage(TreeHtmlListPage):
+        iterparse = True
+
+    results = []
+    for cls in (TreeHtmlListPage, IterHtmlListPage):
+        p = cls(source=SOURCE)
+        p.response = Response(content)
+        p.postprocess_response()
+        results.append(list(p.process_page()))
+    assert results[0] == results[1]
+    assert results[1] == ["one 1", "twonestedmore 2", "nested", "more 2", "three"]
+
+
+def test_html_list_page_iterparse_unknown_charset():
+    class IterHtmlListPage(HtmlListPage):
+        selector = CSS("li")
+        iterparse = True
+
+        def process_item(self, item):
+            return item.text
+
+    p = IterHtmlListPage(source=SOURCE)
+    p.response = Response(b"<ul><li>one</li><li>two</li></ul>", encoding="x-unknown-cs")
+    p.response.headers = {"content-type": "text/html; charset=x-unknown-cs"}
+    p.postprocess_response()
+    assert list(p.process_page()) == ["one", "two"]
+
+
+def test_html_list_page_iterparse_num_items():
+    class IterHtmlListPage(HtmlListPage):
+        selector = XPath("//li", num_items=2)
+        iterparse = True
+
+        def process_item(self, item):
+            return item.text
+
+    p = IterHtmlListPage(source=SOURCE)
+    p.response = Response(b"<ul><li>one</li><li>two</li><li>three</li></ul>")
+    p.postprocess_response()
+    with pytest.raises(SelectorError):
+        list(p.process_page())
+
+
+def test_html_list_page_iterparse_complex_selector():
+    class IterHtmlListPage(HtmlListPage):
+        selector = XPath("//li/text()")
+        iterparse = True
+
+    p = IterHtmlListPage(source=SOURCE)
+    p.response = Response(b"<ul><li>one</li><li>two</li><li>three</li></ul>")
+    p.postprocess_response()
+    assert list(p.process_page()) == ["one", "two", "three"]
+
+
 def test_xml_list_page():
     p = XmlListPage(source=SOURCE)
     p.selector = XPath("//item/text()")
@@ -82,9 +451,50 @@ def test_xml_list_page():
     assert data == ["one", "two", "three"]
 
 
+def test_xml_list_page_iter_tag():
+    class IterXmlListPage(XmlListPage):
+        iter_tag = "item"
+
+        def process_item(self, item):
+            return item.text
+
+    p = IterXmlListPage(source=SOURCE)
+    p.response = Response(
+        b"<resp><item>one</item><skip>x</skip><item>two</item><item>three</item></resp>"
+    )
+    p.postprocess_response()
+    assert not hasattr(p, "root")
+    data = list(p.process_page())
+    assert data == ["one", "two", "three"]
+
+
 def test_json_list_page():
     p = JsonListPage(source=SOURCE)
     p.response = Response(json.dumps(["one", "two", "three"]))
     p.postprocess_response()
     data = list(p.process_page())
     assert data == ["one", "two", "three"]
+
+
+def test_json_list_page_columnar():
+    pytest.importorskip("pyarrow")
+
+    class ColumnarJsonListPage(JsonListPage):
+        columnar = True
+        batch_size = 2
+
+        def process_item(self, batch):
+            return batch.column("n").to_pylist()
+
+    for content in (
+        b'{"n": 1}\n{"n": 2}\n{"n": 3}\n',
+        b' \n[{"n": 1}, {"n": 2}, {"n": 3}]',
+        b'\xef\xbb\xbf[{"n": 1}, {"n": 2}, {"n": 3}]',
+        b"\n" * 70000 + b'[{"n": 1}, {"n": 2}, {"n": 3}]',
+        b'\xef\xbb\xbf{"n": 1}\n{"n": 2}\n{"n": 3}\n',
+    ):
+        p = ColumnarJsonListPage(source=SOURCE)
+        p.response = Response(content)
+        p.postprocess_response()
+        assert p.table.num_rows == 3
+        assert list(p.process_page()) == [[1, 2], [3]]
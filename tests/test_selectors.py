@@ -1,5 +1,6 @@
 import pytest
 import lxml.etree
+import lxml.html
 from spatula import CSS, XPath, SimilarLink, SelectorError, Selector
 
 dummy_html = """<html>
@@ -91,11 +92,39 @@ def test_css_selector():
     assert CSS(".first b").match_one(root).text == "one"
 
 
+def test_css_selector_html():
+    # html translator is case-insensitive for tag names
+    root = lxml.html.fromstring(dummy_html.replace("<b>", "<B>"))
+    selector = CSS("LI b")
+    assert len(selector.match(root, num_items=3)) == 3
+    assert len(selector.match(root, num_items=3)) == 3
+    assert list(selector._compiled) == ["html"]
+
+
 def test_xpath_selector():
     root = lxml.etree.fromstring(dummy_html)
     assert len(XPath("//b").match(root, num_items=3)) == 3
 
 
+def test_xpath_selector_compiled_once():
+    root = lxml.etree.fromstring(dummy_html)
+    selector = XPath("//b/text()")
+    assert selector.match(root) == ["one", "two", "three"]
+    compiled = selector._compiled
+    assert selector.match(root) == ["one", "two", "three"]
+    assert selector._compiled is compiled
+
+
 def test_similar_link_selector():
     root = lxml.etree.fromstring(dummy_html)
     assert len(SimilarLink("https").match(root)) == 2
+
+
+def test_simple_tag():
+    assert XPath("//tr")._simple_tag() == "tr"
+    assert XPath("//tbody/tr")._simple_tag() is None
+    assert XPath("//tr[@class]")._simple_tag() is None
+    assert CSS("tr")._simple_tag() == "tr"
+    assert CSS("tbody tr")._simple_tag() is None
+    assert CSS("tr.odd")._simple_tag() is None
+    assert SimilarLink("https")._simple_tag() is None
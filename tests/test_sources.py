@@ -0,0 +1,117 @@
+import concurrent.futures
+import requests
+from spatula import URL, ConditionalCache, Page, HtmlPage
+from spatula.sources import _pooled_scraper, _POOL_SIZE
+
+SOURCE = "https://example.com"
+
+
+def make_response(status_code, content=b"", headers=None):
+    response = requests.models.Response()
+    response.status_code = status_code
+    response._content = content
+    response._content_consumed = True
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    return response
+
+
+class RevalidatingScraper:
+    """serves a 200 with an ETag, then a 304 if the ETag is sent back"""
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, url, headers=None, **kwargs):
+        self.requests.append(headers)
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return make_response(304)
+        return make_response(200, b"hello", {"ETag": '"v1"'})
+
+
+def test_url_stream_passed_to_scraper():
+    class StreamScraper:
+        def request(self, stream, **kwargs):
+            return stream
+
+    assert URL(SOURCE).get_response(StreamScraper()) is False
+    assert URL(SOURCE, stream=True).get_response(StreamScraper()) is True
+
+
+def test_conditional_cache_revalidates(tmp_path):
+    cache = ConditionalCache(str(tmp_path / "cache.db"))
+    scraper = RevalidatingScraper()
+
+    first = cache.get_response(URL(SOURCE), scraper)
+    assert first.content == b"hello"
+    assert scraper.requests[0] is None
+
+    second = cache.get_response(URL(SOURCE, headers={"X-Test": "1"}), scraper)
+    assert scraper.requests[1] == {"X-Test": "1", "If-None-Match": '"v1"'}
+    assert list(second.iter_content(2)) == [b"he", b"ll", b"o"]
+    assert second.status_code == 200
+    assert second.content == b"hello"
+    assert second.text == "hello"
+    assert second.fromcache
+
+
+def test_conditional_cache_skips_unvalidated(tmp_path):
+    class PlainScraper:
+        def request(self, url, headers=None, **kwargs):
+            assert headers is None
+            return make_response(200, b"hello")
+
+    cache = ConditionalCache(str(tmp_path / "cache.db"))
+    cache.get_response(URL(SOURCE), PlainScraper())
+    cache.get_response(URL(SOURCE), PlainScraper())
+
+
+def test_conditional_cache_threads(tmp_path):
+    cache = ConditionalCache(str(tmp_path / "cache.db"))
+    scraper = RevalidatingScraper()
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        responses = list(
+            pool.map(
+                lambda n: cache.get_response(URL(f"{SOURCE}/{n % 4}"), scraper),
+                range(32),
+            )
+        )
+    assert all(r.content == b"hello" for r in responses)
+
+
+def test_page_uses_scraper_http_cache(tmp_path):
+    class RawPage(Page):
+        source = SOURCE
+
+        def process_page(self):
+            return self.response
+
+    scraper = RevalidatingScraper()
+    scraper.http_cache = ConditionalCache(str(tmp_path / "cache.db"))
+    list(RawPage()._to_items(scraper))
+    response = list(RawPage()._to_items(scraper))[0]
+    assert scraper.requests[1] == {"If-None-Match": '"v1"'}
+    assert response.fromcache
+
+
+def test_conditional_cache_skips_streamed(tmp_path):
+    class StreamedPage(HtmlPage):
+        source = URL(SOURCE, stream=True)
+
+        def process_page(self):
+            return self.root.text_content()
+
+    scraper = RevalidatingScraper()
+    scraper.http_cache = ConditionalCache(str(tmp_path / "cache.db"))
+    for _ in range(2):
+        assert list(StreamedPage()._to_items(scraper)) == ["hello"]
+    assert scraper.requests == [None, None]
+
+
+def test_pooled_scraper():
+    scraper = _pooled_scraper(requests_per_minute=0)
+    adapter = scraper.get_adapter("https://example.com")
+    assert adapter is scraper.get_adapter("http://example.com")
+    assert adapter._pool_connections == _POOL_SIZE
+    assert adapter._pool_maxsize == _POOL_SIZE
+    assert scraper.requests_per_minute == 0